@@ -0,0 +1,16 @@
+"""
+Shared pytest configuration for the Python test suite.
+
+Puts scripts/python on sys.path once per session so the test modules can
+import the scripts directly, instead of each module prepending the path
+at import time.
+"""
+
+import os
+import sys
+
+_SCRIPTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'python'))
+
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
@@ -8,15 +8,14 @@ Tests for the IAM compliance auditing system including:
 - Report generation
 """
 
+import base64
+import io
+import json
+
 import pytest
-from unittest.mock import Mock, patch
 from datetime import datetime, timedelta, timezone
-import sys
-import os
-
-# Add scripts directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'python'))
 
+# scripts/python is put on sys.path by tests/python/conftest.py
 from compliance_audit import (
     IAMComplianceAuditor,
     Finding,
@@ -26,9 +25,36 @@ from compliance_audit import (
     DEMO_USERS,
     MAX_PASSWORD_AGE_DAYS,
     MAX_ACCESS_KEY_AGE_DAYS,
-    MAX_UNUSED_DAYS
+    MAX_UNUSED_DAYS,
+    _PolicyArnTrie
 )
 
+# One clock read for the whole module; ages in the fixtures are large
+# enough that drift over a test run can't flip a threshold
+NOW = datetime.now(timezone.utc)
+DAYS = timedelta(days=1)
+
+# Fields every demo user record must carry
+REQUIRED_USER_FIELDS = frozenset({
+    "UserName", "UserId", "CreateDate", "PasswordLastUsed",
+    "MFADevices", "AccessKeys", "AttachedPolicies", "Groups"
+})
+
+
+@pytest.fixture(scope="module")
+def _shared_auditor():
+    """One demo-mode auditor for the whole module; construction is pure
+    bookkeeping, so building it per test is just repeated setup cost"""
+    return IAMComplianceAuditor(demo_mode=True)
+
+
+@pytest.fixture
+def auditor(_shared_auditor):
+    """The shared auditor, reset to a clean slate for each test"""
+    _shared_auditor.findings.clear()
+    _shared_auditor._seen_findings.clear()
+    return _shared_auditor
+
 
 class TestSeverityEnum:
     """Tests for Severity enumeration"""
@@ -157,128 +183,67 @@ class TestIAMComplianceAuditor:
         assert auditor.demo_mode is True
         assert auditor._iam_client is None
 
-    def test_get_users_returns_demo_data(self):
+    def test_get_users_returns_demo_data(self, auditor):
         """Test that demo mode returns demo users"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
         users = auditor._get_users()
 
         assert len(users) == len(DEMO_USERS)
         assert users[0]["UserName"] == "admin_user"
 
-    def test_run_full_audit_returns_report(self):
+    def test_run_full_audit_returns_report(self, auditor):
         """Test that full audit returns a report"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
         report = auditor.run_full_audit()
 
         assert isinstance(report, AuditReport)
         assert report.total_users == len(DEMO_USERS)
         assert report.total_findings > 0
 
-    def test_mfa_check_finds_violations(self):
-        """Test that MFA check identifies users without MFA"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
-
-        # User with console access but no MFA
-        user = {
-            "UserName": "no_mfa_user",
-            "PasswordLastUsed": datetime.now(timezone.utc),
-            "MFADevices": []
-        }
-
-        auditor._check_mfa_enabled(user)
-
-        # Should have one finding
-        assert len(auditor.findings) == 1
-        assert auditor.findings[0].rule_id == "CIS-1.2"
-        assert auditor.findings[0].severity == Severity.HIGH
-
-    def test_mfa_check_compliant_user(self):
-        """Test that MFA check passes for compliant user"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
-
-        # User with MFA enabled
-        user = {
-            "UserName": "mfa_user",
-            "PasswordLastUsed": datetime.now(timezone.utc),
-            "MFADevices": [{"SerialNumber": "arn:aws:iam::123:mfa/mfa_user"}]
-        }
-
-        auditor._check_mfa_enabled(user)
-
-        # Should have no findings
-        assert len(auditor.findings) == 0
-
-    def test_access_key_age_check(self):
-        """Test access key age compliance check"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
-
-        # User with old access key
-        user = {
-            "UserName": "old_key_user",
-            "AccessKeys": [{
-                "AccessKeyId": "AKIAEXAMPLE",
-                "Status": "Active",
-                "CreateDate": datetime.now(timezone.utc) - timedelta(days=120)
-            }]
-        }
-
-        auditor._check_access_key_age(user)
-
-        # Should have one finding
-        assert len(auditor.findings) == 1
-        assert auditor.findings[0].rule_id == "CIS-1.4"
-
-    def test_access_key_age_compliant(self):
-        """Test access key age passes for recent key"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
-
-        # User with recent access key
-        user = {
-            "UserName": "new_key_user",
-            "AccessKeys": [{
-                "AccessKeyId": "AKIAEXAMPLE",
-                "Status": "Active",
-                "CreateDate": datetime.now(timezone.utc) - timedelta(days=30)
-            }]
-        }
-
-        auditor._check_access_key_age(user)
-
-        # Should have no findings
-        assert len(auditor.findings) == 0
-
-    def test_unused_credentials_check(self):
-        """Test unused credentials compliance check"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
-
-        # User who hasn't logged in for a while
-        user = {
-            "UserName": "inactive_user",
-            "PasswordLastUsed": datetime.now(timezone.utc) - timedelta(days=100)
-        }
-
-        auditor._check_unused_credentials(user)
-
-        # Should have one finding
-        assert len(auditor.findings) == 1
-        assert auditor.findings[0].rule_id == "CIS-1.3"
-
-    def test_multiple_access_keys_check(self):
+    @pytest.mark.parametrize("check,user,expected,rule_id,severity", [
+        # Console access without MFA
+        ("_check_mfa_enabled",
+         {"UserName": "no_mfa_user", "PasswordLastUsed": NOW, "MFADevices": []},
+         1, "CIS-1.2", Severity.HIGH),
+        # MFA enabled -> compliant
+        ("_check_mfa_enabled",
+         {"UserName": "mfa_user", "PasswordLastUsed": NOW,
+          "MFADevices": [{"SerialNumber": "arn:aws:iam::123:mfa/mfa_user"}]},
+         0, None, None),
+        # Access key past the rotation window
+        ("_check_access_key_age",
+         {"UserName": "old_key_user",
+          "AccessKeys": [{"AccessKeyId": "AKIAEXAMPLE", "Status": "Active",
+                          "CreateDate": NOW - 120 * DAYS}]},
+         1, "CIS-1.4", None),
+        # Recent access key -> compliant
+        ("_check_access_key_age",
+         {"UserName": "new_key_user",
+          "AccessKeys": [{"AccessKeyId": "AKIAEXAMPLE", "Status": "Active",
+                          "CreateDate": NOW - 30 * DAYS}]},
+         0, None, None),
+        # Password unused past the threshold
+        ("_check_unused_credentials",
+         {"UserName": "inactive_user", "PasswordLastUsed": NOW - 100 * DAYS},
+         1, "CIS-1.3", None),
+    ])
+    def test_credential_checks(self, auditor, check, user, expected, rule_id, severity):
+        """Violating and compliant users for each per-user credential check"""
+        getattr(auditor, check)(user)
+
+        assert len(auditor.findings) == expected
+        if rule_id is not None:
+            assert auditor.findings[0].rule_id == rule_id
+        if severity is not None:
+            assert auditor.findings[0].severity == severity
+
+    def test_multiple_access_keys_check(self, auditor):
         """Test multiple access keys finding"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
 
         # User with multiple active keys
         user = {
             "UserName": "multi_key_user",
             "AccessKeys": [
-                {"AccessKeyId": "AKIA1", "Status": "Active", "CreateDate": datetime.now(timezone.utc)},
-                {"AccessKeyId": "AKIA2", "Status": "Active", "CreateDate": datetime.now(timezone.utc)}
+                {"AccessKeyId": "AKIA1", "Status": "Active", "CreateDate": NOW},
+                {"AccessKeyId": "AKIA2", "Status": "Active", "CreateDate": NOW}
             ]
         }
 
@@ -289,10 +254,8 @@ class TestIAMComplianceAuditor:
         assert auditor.findings[0].rule_id == "BP-1"
         assert auditor.findings[0].severity == Severity.LOW
 
-    def test_direct_policy_attachment_check(self):
+    def test_direct_policy_attachment_check(self, auditor):
         """Test direct policy attachment finding"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
 
         # User with directly attached policies
         user = {
@@ -308,10 +271,8 @@ class TestIAMComplianceAuditor:
         assert len(auditor.findings) == 1
         assert auditor.findings[0].rule_id == "BP-2"
 
-    def test_admin_privileges_check(self):
+    def test_admin_privileges_check(self, auditor):
         """Test admin privileges check finds violations"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
-        auditor.findings = []
 
         # User with admin policy
         user = {
@@ -328,9 +289,8 @@ class TestIAMComplianceAuditor:
         assert auditor.findings[0].rule_id == "CIS-1.16"
         assert auditor.findings[0].severity == Severity.CRITICAL
 
-    def test_compliance_score_calculation(self):
+    def test_compliance_score_calculation(self, auditor):
         """Test compliance score is calculated correctly"""
-        auditor = IAMComplianceAuditor(demo_mode=True)
 
         # Create some findings
         auditor.findings = [
@@ -362,6 +322,116 @@ class TestIAMComplianceAuditor:
         assert report.compliance_score == 50.0
 
 
+class TestPolicyArnTrie:
+    """Tests for the compressed ARN-pattern trie"""
+
+    def test_exact_match(self):
+        """Test that a non-wildcard pattern matches only the full ARN"""
+        trie = _PolicyArnTrie(["arn:aws:iam::aws:policy/PowerUserAccess"])
+        assert trie.matches("arn:aws:iam::aws:policy/PowerUserAccess")
+        assert not trie.matches("arn:aws:iam::aws:policy/PowerUser")
+        assert not trie.matches("arn:aws:iam::aws:policy/PowerUserAccessV2")
+
+    def test_wildcard_prefix_match(self):
+        """Test that a trailing * matches any ARN sharing the prefix"""
+        trie = _PolicyArnTrie(["arn:aws:iam::aws:policy/AdministratorAccess-*"])
+        assert trie.matches("arn:aws:iam::aws:policy/AdministratorAccess-Amplify")
+        assert not trie.matches("arn:aws:iam::aws:policy/AdministratorAccess")
+        assert not trie.matches("arn:aws:iam::aws:policy/ReadOnlyAccess")
+
+    def test_edge_split_keeps_both_patterns(self):
+        """Test that patterns sharing a prefix still match after the split"""
+        trie = _PolicyArnTrie([
+            "arn:aws:iam::aws:policy/AdministratorAccess",
+            "arn:aws:iam::aws:policy/AdministratorAccess-*",
+            "arn:aws:iam::aws:policy/IAMFullAccess",
+        ])
+        assert trie.matches("arn:aws:iam::aws:policy/AdministratorAccess")
+        assert trie.matches("arn:aws:iam::aws:policy/AdministratorAccess-Amplify")
+        assert trie.matches("arn:aws:iam::aws:policy/IAMFullAccess")
+        assert not trie.matches("arn:aws:iam::aws:policy/IAMReadOnlyAccess")
+
+    def test_empty_trie_matches_nothing(self):
+        """Test that a trie with no patterns never matches"""
+        trie = _PolicyArnTrie()
+        assert not trie.matches("arn:aws:iam::aws:policy/AdministratorAccess")
+        assert not trie.matches("")
+
+
+class TestFindingDeduplication:
+    """Tests for duplicate-finding suppression"""
+
+    def test_duplicate_findings_are_dropped(self, auditor):
+        """Test that re-running a check on the same user adds no duplicate"""
+        user = {
+            "UserName": "admin_user",
+            "AttachedPolicies": [
+                {"PolicyName": "AdministratorAccess",
+                 "PolicyArn": "arn:aws:iam::aws:policy/AdministratorAccess"}
+            ]
+        }
+
+        auditor._check_admin_privileges(user)
+        auditor._check_admin_privileges(user)
+
+        assert len(auditor.findings) == 1
+
+
+class TestFindingsStream:
+    """Tests for NDJSON streaming during an audit"""
+
+    def test_stream_emits_findings_and_summary(self, auditor):
+        """Test that each finding is streamed as one line plus a footer"""
+        stream = io.StringIO()
+        report = auditor.run_full_audit(findings_stream=stream)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        # One line per finding, then exactly one summary footer
+        assert len(lines) == report.total_findings + 1
+        assert lines[0]["rule_id"]
+        assert lines[-1]["summary"]["total_findings"] == report.total_findings
+
+
+class TestCredentialReport:
+    """Tests for the account credential-report fast path"""
+
+    def test_report_rows_keyed_by_user(self, auditor):
+        """Test that a COMPLETE report is decoded into per-user rows"""
+        content = base64.b64encode(
+            b"user,mfa_active,password_last_used\n"
+            b"alice,true,2024-01-01T00:00:00+00:00\n"
+            b"bob,false,N/A\n"
+        )
+
+        class StubIAM:
+            def generate_credential_report(self):
+                return {"State": "COMPLETE"}
+
+            def get_credential_report(self):
+                return {"Content": content}
+
+        auditor._iam_client = StubIAM()
+        rows = auditor._fetch_credential_report()
+        auditor._iam_client = None
+
+        assert rows["alice"]["mfa_active"] == "true"
+        assert rows["bob"]["password_last_used"] == "N/A"
+
+    def test_report_failure_falls_back_to_empty(self, auditor):
+        """Test that report errors degrade to the per-user call path"""
+
+        class BrokenIAM:
+            def generate_credential_report(self):
+                raise RuntimeError("access denied")
+
+        auditor._iam_client = BrokenIAM()
+        rows = auditor._fetch_credential_report()
+        auditor._iam_client = None
+
+        assert rows == {}
+
+
 class TestDemoUsers:
     """Tests for demo user data"""
 
@@ -371,19 +441,19 @@ class TestDemoUsers:
 
     def test_demo_users_have_required_fields(self):
         """Test that demo users have all required fields"""
-        required_fields = [
-            "UserName", "UserId", "CreateDate", "PasswordLastUsed",
-            "MFADevices", "AccessKeys", "AttachedPolicies", "Groups"
-        ]
-
         for user in DEMO_USERS:
-            for field in required_fields:
-                assert field in user, f"User missing field: {field}"
+            missing = REQUIRED_USER_FIELDS - user.keys()
+            assert not missing, f"User missing fields: {missing}"
 
     def test_demo_users_have_variety(self):
         """Test that demo users represent different compliance states"""
-        mfa_enabled = sum(1 for u in DEMO_USERS if len(u.get("MFADevices", [])) > 0)
-        mfa_disabled = sum(1 for u in DEMO_USERS if len(u.get("MFADevices", [])) == 0)
+        # Single pass: count both populations with one lookup per user
+        mfa_enabled = mfa_disabled = 0
+        for u in DEMO_USERS:
+            if u.get("MFADevices"):
+                mfa_enabled += 1
+            else:
+                mfa_disabled += 1
 
         # Should have both MFA enabled and disabled users for testing
         assert mfa_enabled > 0
@@ -8,15 +8,11 @@ Tests for the IAM user provisioning system including:
 - Provisioning workflows
 """
 
-import pytest
-from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime
-import sys
-import os
+import dataclasses
 
-# Add scripts directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'python'))
+import pytest
 
+# scripts/python is put on sys.path by tests/python/conftest.py
 from iam_provisioner import (
     IAMProvisioner,
     UserRequest,
@@ -27,92 +23,69 @@ from iam_provisioner import (
 )
 
 
+# Canonical valid request; tests derive variants with dataclasses.replace
+# instead of re-spelling all six fields
+BASE_REQUEST = UserRequest(
+    username="jsmith",
+    email="jsmith@company.com",
+    department="Engineering",
+    role="Developer",
+    first_name="John",
+    last_name="Smith"
+)
+
+
+@pytest.fixture(scope="module")
+def _shared_provisioner():
+    """One demo-mode provisioner for the whole module"""
+    return IAMProvisioner(demo_mode=True)
+
+
+@pytest.fixture
+def provisioner(_shared_provisioner):
+    """The shared provisioner with its result state reset for each test"""
+    p = _shared_provisioner
+    p.provisioned_users.clear()
+    p._ok_names.clear()
+    p._failures.clear()
+    p._n_ok = p._n_fail = 0
+    return p
+
+
 class TestUserRequest:
     """Tests for UserRequest dataclass validation"""
 
     def test_valid_user_request(self):
         """Test that valid user request passes validation"""
-        request = UserRequest(
-            username="jsmith",
-            email="jsmith@company.com",
-            department="Engineering",
-            role="Developer",
-            first_name="John",
-            last_name="Smith"
-        )
-        assert request.validate() is True
+        assert BASE_REQUEST.validate() is True
 
     def test_invalid_email_no_at_symbol(self):
         """Test that email without @ fails validation"""
-        request = UserRequest(
-            username="jsmith",
-            email="invalid-email",
-            department="Engineering",
-            role="Developer",
-            first_name="John",
-            last_name="Smith"
-        )
+        request = dataclasses.replace(BASE_REQUEST, email="invalid-email")
         assert request.validate() is False
 
     def test_username_too_short(self):
         """Test that username < 3 characters fails validation"""
-        request = UserRequest(
-            username="js",
-            email="jsmith@company.com",
-            department="Engineering",
-            role="Developer",
-            first_name="John",
-            last_name="Smith"
-        )
+        request = dataclasses.replace(BASE_REQUEST, username="js")
         assert request.validate() is False
 
     def test_username_too_long(self):
         """Test that username > 64 characters fails validation"""
-        request = UserRequest(
-            username="a" * 65,
-            email="test@company.com",
-            department="IT",
-            role="Developer",
-            first_name="Test",
-            last_name="User"
-        )
+        request = dataclasses.replace(BASE_REQUEST, username="a" * 65)
         assert request.validate() is False
 
     def test_missing_required_fields(self):
         """Test that missing required fields fail validation"""
-        request = UserRequest(
-            username="jsmith",
-            email="jsmith@company.com",
-            department="",  # Empty department
-            role="Developer",
-            first_name="John",
-            last_name="Smith"
-        )
+        request = dataclasses.replace(BASE_REQUEST, department="")
         assert request.validate() is False
 
     def test_display_name_property(self):
         """Test that display_name property returns correct format"""
-        request = UserRequest(
-            username="jsmith",
-            email="jsmith@company.com",
-            department="Engineering",
-            role="Developer",
-            first_name="John",
-            last_name="Smith"
-        )
-        assert request.display_name == "John Smith"
+        assert BASE_REQUEST.display_name == "John Smith"
 
     def test_optional_manager_field(self):
         """Test that manager field is optional"""
-        request = UserRequest(
-            username="jsmith",
-            email="jsmith@company.com",
-            department="Engineering",
-            role="Developer",
-            first_name="John",
-            last_name="Smith",
-            manager="mwilliams"
-        )
+        request = dataclasses.replace(BASE_REQUEST, manager="mwilliams")
         assert request.validate() is True
         assert request.manager == "mwilliams"
 
@@ -167,48 +140,36 @@ class TestIAMProvisioner:
         assert provisioner._s3_client is None
         assert provisioner._sns_client is None
 
-    def test_password_generation_length(self):
+    def test_password_generation_length(self, provisioner):
         """Test that generated password meets length requirement"""
-        provisioner = IAMProvisioner(demo_mode=True)
         password = provisioner._generate_password()
         assert len(password) == PASSWORD_LENGTH
 
-    def test_password_generation_has_uppercase(self):
+    def test_password_generation_has_uppercase(self, provisioner):
         """Test that generated password contains uppercase letter"""
-        provisioner = IAMProvisioner(demo_mode=True)
         password = provisioner._generate_password()
         assert any(c.isupper() for c in password), "Password must contain uppercase"
 
-    def test_password_generation_has_lowercase(self):
+    def test_password_generation_has_lowercase(self, provisioner):
         """Test that generated password contains lowercase letter"""
-        provisioner = IAMProvisioner(demo_mode=True)
         password = provisioner._generate_password()
         assert any(c.islower() for c in password), "Password must contain lowercase"
 
-    def test_password_generation_has_digit(self):
+    def test_password_generation_has_digit(self, provisioner):
         """Test that generated password contains digit"""
-        provisioner = IAMProvisioner(demo_mode=True)
         password = provisioner._generate_password()
         assert any(c.isdigit() for c in password), "Password must contain digit"
 
-    def test_password_generation_uniqueness(self):
+    def test_password_generation_uniqueness(self, provisioner):
         """Test that generated passwords are unique"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        passwords = [provisioner._generate_password() for _ in range(10)]
-        # All passwords should be unique
-        assert len(passwords) == len(set(passwords))
+        # Set comprehension: builds in one pass, duplicates collapse on insert
+        assert len({provisioner._generate_password() for _ in range(10)}) == 10
 
-    def test_create_user_demo_mode(self):
+    def test_create_user_demo_mode(self, provisioner):
         """Test user creation in demo mode"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="testuser",
-            email="test@company.com",
-            department="IT",
-            role="Developer",
-            first_name="Test",
-            last_name="User"
-        )
+        request = dataclasses.replace(
+            BASE_REQUEST, username="testuser", email="test@company.com",
+            department="IT")
 
         result = provisioner.create_user(request)
 
@@ -217,53 +178,28 @@ class TestIAMProvisioner:
         assert "StandardUsers" in result.groups_assigned
         assert "IT-Users" in result.groups_assigned
 
-    def test_create_user_invalid_request(self):
+    def test_create_user_invalid_request(self, provisioner):
         """Test that invalid user request returns failure"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="ab",  # Too short
-            email="invalid",
-            department="IT",
-            role="Developer",
-            first_name="",
-            last_name=""
-        )
+        # Username too short, email invalid
+        request = dataclasses.replace(BASE_REQUEST, username="ab", email="invalid")
 
         result = provisioner.create_user(request)
 
         assert result.success is False
         assert "Validation failed" in result.message
 
-    def test_assign_groups_for_engineering(self):
+    def test_assign_groups_for_engineering(self, provisioner):
         """Test that Engineering department gets correct groups"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="engineer",
-            email="engineer@company.com",
-            department="Engineering",
-            role="Developer",
-            first_name="Test",
-            last_name="Engineer"
-        )
-
-        groups = provisioner._assign_groups(request)
+        groups = provisioner._assign_groups(BASE_REQUEST)
 
         assert "StandardUsers" in groups
         assert "Engineering-Users" in groups
         assert "Developer-Tools" in groups
         assert "S3-Dev-Access" in groups
 
-    def test_assign_groups_for_finance(self):
+    def test_assign_groups_for_finance(self, provisioner):
         """Test that Finance department gets correct groups"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="finance",
-            email="finance@company.com",
-            department="Finance",
-            role="Analyst",
-            first_name="Test",
-            last_name="Finance"
-        )
+        request = dataclasses.replace(BASE_REQUEST, department="Finance", role="Analyst")
 
         groups = provisioner._assign_groups(request)
 
@@ -271,41 +207,22 @@ class TestIAMProvisioner:
         assert "Finance-Users" in groups
         assert "Billing-ReadOnly" in groups
 
-    def test_attach_policies_for_developer(self):
+    def test_attach_policies_for_developer(self, provisioner):
         """Test that Developer role gets correct policies"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="dev",
-            email="dev@company.com",
-            department="IT",
-            role="Developer",
-            first_name="Test",
-            last_name="Developer"
-        )
-
-        policies = provisioner._attach_policies(request)
+        policies = provisioner._attach_policies(BASE_REQUEST)
 
         assert "arn:aws:iam::aws:policy/PowerUserAccess" in policies
 
-    def test_attach_policies_for_admin(self):
+    def test_attach_policies_for_admin(self, provisioner):
         """Test that Admin role gets AdministratorAccess"""
-        provisioner = IAMProvisioner(demo_mode=True)
-        request = UserRequest(
-            username="admin",
-            email="admin@company.com",
-            department="IT",
-            role="Admin",
-            first_name="Test",
-            last_name="Admin"
-        )
+        request = dataclasses.replace(BASE_REQUEST, role="Admin")
 
         policies = provisioner._attach_policies(request)
 
         assert "arn:aws:iam::aws:policy/AdministratorAccess" in policies
 
-    def test_get_summary_empty(self):
+    def test_get_summary_empty(self, provisioner):
         """Test summary with no provisioned users"""
-        provisioner = IAMProvisioner(demo_mode=True)
         summary = provisioner.get_summary()
 
         assert summary["total_processed"] == 0
@@ -313,21 +230,18 @@ class TestIAMProvisioner:
         assert summary["failed"] == 0
         assert summary["success_rate"] == "0.0%"
 
-    def test_get_summary_after_provisioning(self):
+    def test_get_summary_after_provisioning(self, provisioner):
         """Test summary after provisioning users"""
-        provisioner = IAMProvisioner(demo_mode=True)
 
-        # Provision some users
-        for i in range(3):
-            request = UserRequest(
-                username=f"user{i}",
-                email=f"user{i}@company.com",
-                department="IT",
-                role="Developer",
-                first_name="Test",
-                last_name=f"User{i}"
-            )
-            provisioner.create_user(request)
+        # Provision some users in one batch
+        requests = [
+            dataclasses.replace(
+                BASE_REQUEST, username=f"user{i}", email=f"user{i}@company.com")
+            for i in range(3)
+        ]
+        results = provisioner.create_users(requests)
+
+        assert all(r.success for r in results)
 
         summary = provisioner.get_summary()
 
@@ -340,19 +254,16 @@ class TestIAMProvisioner:
 class TestDepartmentAndRoleMappings:
     """Tests for department and role configuration"""
 
-    def test_all_departments_have_groups(self):
-        """Test that all departments have group mappings"""
-        expected_departments = ["IT", "Finance", "HR", "Engineering", "Marketing", "Sales"]
-        for dept in expected_departments:
-            assert dept in DEPARTMENT_GROUPS
-            assert len(DEPARTMENT_GROUPS[dept]) > 0
+    @pytest.mark.parametrize(
+        "dept", ["IT", "Finance", "HR", "Engineering", "Marketing", "Sales"])
+    def test_department_has_groups(self, dept):
+        """Test that each department has a non-empty group mapping"""
+        assert DEPARTMENT_GROUPS.get(dept)
 
-    def test_all_roles_have_policies(self):
-        """Test that all roles have policy mappings"""
-        expected_roles = ["Developer", "Analyst", "Admin", "Manager"]
-        for role in expected_roles:
-            assert role in ROLE_POLICIES
-            assert len(ROLE_POLICIES[role]) > 0
+    @pytest.mark.parametrize("role", ["Developer", "Analyst", "Admin", "Manager"])
+    def test_role_has_policies(self, role):
+        """Test that each role has a non-empty policy mapping"""
+        assert ROLE_POLICIES.get(role)
 
     def test_developer_policy_is_power_user(self):
         """Test that Developer role maps to PowerUserAccess"""
@@ -385,28 +296,16 @@ class TestAuditLogDecorator:
 class TestProvisioningWorkflow:
     """Integration tests for complete provisioning workflow"""
 
-    def test_full_provisioning_workflow(self):
+    def test_full_provisioning_workflow(self, provisioner):
         """Test complete provisioning workflow in demo mode"""
-        provisioner = IAMProvisioner(demo_mode=True)
 
         # Create multiple users
         users = [
-            UserRequest(
-                username="jsmith",
-                email="jsmith@company.com",
-                department="Engineering",
-                role="Developer",
-                first_name="John",
-                last_name="Smith"
-            ),
-            UserRequest(
-                username="ajohnson",
-                email="ajohnson@company.com",
-                department="Finance",
-                role="Analyst",
-                first_name="Alice",
-                last_name="Johnson"
-            ),
+            BASE_REQUEST,
+            dataclasses.replace(
+                BASE_REQUEST, username="ajohnson", email="ajohnson@company.com",
+                department="Finance", role="Analyst",
+                first_name="Alice", last_name="Johnson"),
         ]
 
         results = []